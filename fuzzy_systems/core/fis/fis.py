@@ -138,6 +138,14 @@ class FIS(metaclass=ABCMeta):
         # Aggregate consequents
         self._aggregated_consequents = self._aggregate(rules_implicated_cons)
 
+        # the implicated consequents are owned by the rules and overwritten by
+        # their next implicate() call (e.g. by another FIS sharing the rules),
+        # so keep a copy of them for last_implicated_consequents
+        self._implicated_consequents = defaultdict(list)
+        for lv_name, lv_impl_mf in rules_implicated_cons.items():
+            self._implicated_consequents[lv_name].extend(
+                FreeShapeMF(mf.in_values, mf.mf_values) for mf in lv_impl_mf)
+
         # Defuzzify
         return self._defuzzify()
 
@@ -1,5 +1,6 @@
 from fuzzy_systems.core.linguistic_variables.linguistic_variable import LinguisticVariable
-from fuzzy_systems.core.membership_functions.lin_piece_wise_mf import LinPWMF
+from fuzzy_systems.core.membership_functions.lin_piece_wise_mf import \
+    shared_lin_pw_mf
 
 
 class ThreePointsLV(LinguisticVariable):
@@ -41,9 +42,9 @@ class ThreePointsLV(LinguisticVariable):
         assert p1 < p2 < p3, "Points values have to be given in the increasing order"
 
         ling_values_dict = {
-            n1: LinPWMF([p1, 1], [p2, 0]),
-            n2: LinPWMF([p1, 0], [p2, 1], [p3, 0]),
-            n3: LinPWMF([p2, 0], [p3, 1])
+            n1: shared_lin_pw_mf([p1, 1], [p2, 0]),
+            n2: shared_lin_pw_mf([p1, 0], [p2, 1], [p3, 0]),
+            n3: shared_lin_pw_mf([p2, 0], [p3, 1])
         }
         args = name, ling_values_dict
         super().__init__(*args)
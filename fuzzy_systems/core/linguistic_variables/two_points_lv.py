@@ -1,6 +1,7 @@
 from fuzzy_systems.core.linguistic_variables.linguistic_variable import \
     LinguisticVariable
-from fuzzy_systems.core.membership_functions.lin_piece_wise_mf import LinPWMF
+from fuzzy_systems.core.membership_functions.lin_piece_wise_mf import \
+    shared_lin_pw_mf
 
 
 class TwoPointsPDLV(LinguisticVariable):
@@ -36,8 +37,8 @@ class TwoPointsPDLV(LinguisticVariable):
         :param n2: name of the second ("high") part of the MF
         """
         ling_values_dict = {
-            n1: LinPWMF([p, 1], [p+d, 0]),
-            n2: LinPWMF([p, 0], [p+d, 1])
+            n1: shared_lin_pw_mf([p, 1], [p+d, 0]),
+            n2: shared_lin_pw_mf([p, 0], [p+d, 1])
         }
         args = name, ling_values_dict
         super().__init__(*args)
@@ -1,6 +1,57 @@
 import numpy as np
 
 
+def _is_frozen(values):
+    """
+    :return: True if neither values nor the array owning its memory can be
+    written, i.e. values can never change
+    """
+    while isinstance(values, np.ndarray):
+        if values.flags.writeable:
+            return False
+        values = values.base
+    return True
+
+
+def as_read_only_array(values):
+    """
+    Return values as a read-only numpy array. Arrays that can never change
+    (read-only and not a view of a writable array) are returned as is (i.e.
+    shared, not copied), anything else is copied into a new array.
+    """
+    if isinstance(values, np.ndarray) and _is_frozen(values):
+        return values
+    values = np.array(values)
+    values.setflags(write=False)
+    return values
+
+
+def read_only_view(values):
+    """
+    Return a read-only view of a numpy array. Changes made to the array are
+    visible through the view, but the view cannot be used to modify it. Since
+    the array can still change, as_read_only_array() copies such views.
+    """
+    view = values.view()
+    view.setflags(write=False)
+    return view
+
+
+def buffer_view_mf(in_values, buffer):
+    """
+    Return a FreeShapeMF whose mf values are a read-only view of buffer
+    instead of a copy of it, so the MF follows the changes made to the buffer
+    (see FuzzyRule.implicate()). Copy it (e.g. FreeShapeMF(mf.in_values,
+    mf.mf_values)) to keep its current values.
+    """
+    assert len(in_values) == len(
+        buffer), "Input and MF values are not the same length"
+    mf = FreeShapeMF.__new__(FreeShapeMF)
+    mf._in_values = as_read_only_array(in_values)
+    mf._mf_values = read_only_view(buffer)
+    return mf
+
+
 class FreeShapeMF:
     def __init__(self, in_values, mf_values):
         """
@@ -10,14 +61,18 @@ class FreeShapeMF:
         This class is the most basic way available to create membership
         functions.
 
+        The values are stored as read-only arrays so that they can be safely
+        shared between membership functions (e.g. by the implicated
+        consequents of a rule) without being copied.
+
         :param in_values:
         :param mf_values:
         """
         assert len(in_values) == len(
             mf_values), "Input and MF values are not the same length"
 
-        self._in_values = np.array(in_values)
-        self._mf_values = np.array(mf_values)
+        self._in_values = as_read_only_array(in_values)
+        self._mf_values = as_read_only_array(mf_values)
 
     def fuzzify(self, in_value):
         # return the nearest mf value for a given in_value using interpolation
@@ -0,0 +1,23 @@
+import numpy as np
+
+from fuzzy_systems.core.membership_functions.smooth_mf import SmoothMF
+
+
+class GaussianMF(SmoothMF):
+    """
+    Assumptions:
+    - mf values are bound to [0, 1]
+
+    This class is more an example of how you can derive SmoothMF
+    """
+
+    def __init__(self, mean, sigma, n_sigmas=4, n_points=50):
+        """
+        Create a gaussian mf centered on mean. The MF is defined on
+        [mean - n_sigmas * sigma, mean + n_sigmas * sigma]
+        """
+        def gaussian(x):
+            return np.exp(-0.5 * ((x - mean) / sigma) ** 2)
+
+        in_range = mean - n_sigmas * sigma, mean + n_sigmas * sigma
+        super().__init__(gaussian, in_range, n_points=n_points)
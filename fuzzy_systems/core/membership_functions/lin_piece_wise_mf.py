@@ -1,3 +1,7 @@
+from bisect import bisect_right
+from copy import copy
+from functools import lru_cache
+
 import numpy as np
 
 from fuzzy_systems.core.membership_functions.free_shape_mf import FreeShapeMF
@@ -27,6 +31,53 @@ def gen_line(p0, p1, n_points):
     return xs, ys
 
 
+def compute_lut(in_values, mf_values, n_entries):
+    """
+    Sample a membership function on a regular grid so it can later be
+    evaluated with a single array lookup instead of an interpolation.
+    :param in_values: x values of the membership function
+    :param mf_values: y values of the membership function
+    :param n_entries: number of entries of the lookup table
+    :return: x0, inv_dx, values where x0 is the first x of the grid, inv_dx
+    the inverse of the grid step and values the sampled mf values
+    """
+    x_min, x_max = np.min(in_values), np.max(in_values)
+    grid = np.linspace(x_min, x_max, n_entries)
+    values = np.interp(grid, in_values, mf_values)
+
+    # a single point MF has a constant LUT, every input maps to entry 0
+    inv_dx = (n_entries - 1) / (x_max - x_min) if x_max > x_min else 0.0
+    return float(x_min), float(inv_dx), values
+
+
+def quantize_lut(values, dtype):
+    """
+    Quantize lookup table values bound to [0, 1] to an unsigned integer type,
+    which divides the memory (and bandwidth) used by the table by 8 for
+    uint8 and by 4 for uint16 compared to float64.
+    :param values: values of the lookup table, in [0, 1]
+    :param dtype: np.uint8 or np.uint16
+    :return: q_values, scale where q_values * scale ~= values
+    """
+    q_max = np.iinfo(dtype).max
+    return np.round(values * q_max).astype(dtype), 1.0 / q_max
+
+
+def lut_lookup(x, x0, inv_dx, values):
+    """
+    Evaluate a lookup table computed by compute_lut() using the nearest entry.
+    Inputs outside the table's range are clamped and NaN inputs give NaN,
+    as np.interp does.
+    :return: the looked up value(s), always as a new array
+    """
+    x = np.asarray(x, dtype=float)
+    is_nan = np.isnan(x)
+    # NaN positions would be cast to an invalid index, map them to entry 0
+    pos = np.where(is_nan, 0.0, (x - x0) * inv_dx + 0.5)
+    idx = np.clip(pos, 0, len(values) - 1).astype(np.intp)
+    return np.where(is_nan, np.nan, values[idx])[()]
+
+
 class LinPWMF(FreeShapeMF):
     """
     This class produce a "linear piece-wise function"-like membership function
@@ -36,7 +87,7 @@ class LinPWMF(FreeShapeMF):
     Feel free to derive this class to create a TriangularMF, LinearMF,...
     """
 
-    def __init__(self, *p_args, n_points=50):
+    def __init__(self, *p_args, n_points=50, n_lut=1024):
         """
         Create a "linear piece-wise function"-like membership function
         :param p_args: this should at least contain 2 items. Each item is
@@ -46,6 +97,8 @@ class LinPWMF(FreeShapeMF):
         :param n_points: as only two points are needed to draw a line, this
         parameter let you choose the granularity (i.e. the number of points)
         to compute between all the piece-wise elements of the function.
+        :param n_lut: number of entries of the lookup table used by
+        fuzzify_lut()
         """
         assert len(p_args) >= 2, "Cannot produce MF with less than 2 points"
         n_pts = n_points
@@ -59,5 +112,113 @@ class LinPWMF(FreeShapeMF):
             in_values.extend(xs)
             mf_values.extend(ys)
 
-        super(LinPWMF, self).__init__(in_values, mf_values)
+        # single precision is enough for membership values and halves the
+        # memory used by them. The in values stay in double precision since
+        # they can be large (e.g. timestamps) while the MF is narrow
+        super(LinPWMF, self).__init__(
+            np.ascontiguousarray(in_values, dtype=np.float64),
+            np.ascontiguousarray(mf_values, dtype=np.float32))
+        self._set_lut(n_lut)
+
+        # used by fuzzify_hinted(). Python lists are faster than numpy arrays
+        # to index with scalars
+        self._xp = self._in_values.tolist()
+        self._fp = self._mf_values.tolist()
+
+    def _set_lut(self, n, dtype=None):
+        self._lut_x0, self._lut_inv_dx, self._lut = compute_lut(
+            self._in_values, self._mf_values, n)
+        self._lut_q, self._lut_scale = None, None
+        if dtype is not None:
+            self._lut_q, self._lut_scale = quantize_lut(self._lut, dtype)
+            self._lut_q.setflags(write=False)
+            self._lut = self._lut_q * self._lut_scale
+        self._lut = self._lut.astype(np.float32)
+        self._lut.setflags(write=False)
+
+    def build_lut(self, n=1024, dtype=None):
+        """
+        Return a copy of this MF that uses another lookup table in
+        fuzzify_lut(). 1024 float32 entries fit in 4 kB. This MF itself is
+        left untouched since it may be shared (see shared_lin_pw_mf()).
+        :param n: number of entries of the lookup table
+        :param dtype: None to store the table as float32, np.uint8 or
+        np.uint16 to store it quantized (see quantize_lut())
+        :return: the new MF
+        """
+        mf = copy(self)
+        mf._set_lut(n, dtype)
+        return mf
+
+    def fuzzify_hinted(self, in_value, hint=0):
+        """
+        Same as fuzzify() for a single crisp value, but the search of the
+        segment containing in_value starts from the segment given as hint.
+        Giving the segment returned by the previous call, the search is O(1)
+        instead of O(log(n_points)) when the crisp values change slowly (e.g.
+        in a control loop).
+
+        As np.interp, a MF starting with a vertical edge takes the value after
+        the edge at the edge itself:
+
+        >>> LinPWMF([5, 0], [5, 1], [10, 1]).fuzzify_hinted(5.0)[0]
+        1.0
+
+        :param in_value: a crisp value
+        :param hint: index of the segment to check first
+        :return: value, segment where value is the mf value and segment the
+        hint to give to the next call
+        """
+        if in_value != in_value:  # NaN, as np.interp
+            return in_value, hint
+        xp, fp = self._xp, self._fp
+        # strict, so that bisect_right() picks the last of repeated first
+        # points, as np.interp does
+        if in_value < xp[0]:
+            return fp[0], hint
+        if in_value >= xp[-1]:
+            return fp[-1], hint
+
+        i = hint
+        if not xp[i] <= in_value < xp[i + 1]:
+            i = bisect_right(xp, in_value) - 1
+
+        return fp[i] + (fp[i + 1] - fp[i]) * (in_value - xp[i]) / (
+            xp[i + 1] - xp[i]), i
 
+    @property
+    def lut(self):
+        """
+        :return: x0, inv_dx, values of the lookup table (see compute_lut())
+        """
+        return self._lut_x0, self._lut_inv_dx, self._lut
+
+    def fuzzify_lut(self, in_value):
+        """
+        Same as fuzzify() but uses the lookup table instead of interpolating.
+        The result is exact up to half a table step (and up to the
+        quantization step if the table is quantized).
+        :param in_value: a crisp value or an array of crisp values
+        """
+        if self._lut_q is not None:
+            return lut_lookup(in_value, self._lut_x0, self._lut_inv_dx,
+                              self._lut_q) * self._lut_scale
+        return lut_lookup(in_value, self._lut_x0, self._lut_inv_dx, self._lut)
+
+
+@lru_cache(maxsize=4096)
+def _cached_lin_pw_mf(points):
+    return LinPWMF(*points)
+
+
+def shared_lin_pw_mf(*p_args):
+    """
+    Same as LinPWMF(*p_args) but MF built from the same points are created
+    only once and then shared. A LinPWMF holds no mutable state (its values
+    and lookup table are read-only and build_lut() returns a new MF), so this
+    is safe and avoids rebuilding the same MF (and its lookup table) when
+    many similar linguistic variables are created.
+    :param p_args: see LinPWMF
+    :return: a (possibly shared) LinPWMF
+    """
+    return _cached_lin_pw_mf(tuple(tuple(p) for p in p_args))
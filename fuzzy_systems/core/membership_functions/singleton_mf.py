@@ -1,11 +1,49 @@
 import numpy as np
-from fuzzy_systems.core.membership_functions.lin_piece_wise_mf import FreeShapeMF
+
+from fuzzy_systems.core.membership_functions.free_shape_mf import FreeShapeMF, \
+    as_read_only_array
+
+
+# tolerance used to compare crisp values to the singleton's x
+SINGLETON_EPS = 1e-12
+
 
 class SingletonMF(FreeShapeMF):
+    # mf values are the same for all singletons, share a single array
+    _SINGLETON_MF_VALUES = as_read_only_array(np.array([0, 1],
+                                                       dtype=np.float32))
+
     def __init__(self, x):
-        super().__init__(np.array([x, x]), np.array([0, 1]))
+        """
+        Create a singleton membership function, i.e. a MF that is 1 at x and
+        0 everywhere else.
+
+        Only x is stored, the in_values and mf_values arrays expected from a
+        FreeShapeMF are built the first time they are accessed.
+
+        :param x: the crisp value of the singleton
+        """
+        self._x = x
+        self._in_values = None
 
     def fuzzify(self, in_value):
-        if(in_value == self._in_values[0]):
-            return 1
-        return 0
+        return float(abs(in_value - self._x) < SINGLETON_EPS)
+
+    def fuzzify_vec(self, in_values):
+        """
+        Vectorized version of fuzzify()
+        :param in_values: an array of crisp values
+        :return: an array of mf values (1.0 or 0.0)
+        """
+        return (np.abs(np.asarray(in_values) - self._x) < SINGLETON_EPS
+                ).astype(np.float64)
+
+    @property
+    def in_values(self):
+        if self._in_values is None:
+            self._in_values = as_read_only_array([self._x, self._x])
+        return self._in_values
+
+    @property
+    def mf_values(self):
+        return self._SINGLETON_MF_VALUES
@@ -0,0 +1,60 @@
+import numpy as np
+
+from fuzzy_systems.core.membership_functions.free_shape_mf import FreeShapeMF
+
+try:
+    from function_generator import FunctionGenerator
+except ImportError:  # function_generator is not installed, use the exact func
+    FunctionGenerator = None
+
+
+class SmoothMF(FreeShapeMF):
+    """
+    This class produce a membership function from its exact functional form
+    (e.g. a gaussian, a bell or a sigmoid). The MF is discretized into
+    in_values/mf_values like any other FreeShapeMF, but fuzzify() evaluates
+    the function itself instead of interpolating the discretized values.
+
+    If the function_generator package is installed, the function is replaced
+    by a fast piecewise Chebyshev approximation of it.
+
+    Feel free to derive this class to create a GaussianMF, SigmoidMF,...
+    """
+
+    def __init__(self, func, in_range, n_points=50, tol=1e-8):
+        """
+        Create a membership function from its exact functional form
+        :param func: the membership function. It must take and return numpy
+        arrays and its values must be bound to [0, 1]
+        :param in_range: (min, max) of the crisp values. Values out of this
+        range are clamped to it, as done by FreeShapeMF
+        :param n_points: number of points of the discretized MF
+        :param tol: tolerance of the Chebyshev approximation
+        """
+        in_values = np.linspace(in_range[0], in_range[1], n_points)
+        super(SmoothMF, self).__init__(in_values, func(in_values))
+
+        self._in_range = in_range
+        self._func = func
+        self._core = None
+        if FunctionGenerator is not None:
+            approx = FunctionGenerator(func, in_range[0], in_range[1], tol=tol)
+            self._func = approx
+            # numba jitted scalar version, can be called from njit code
+            self._core = approx.get_base_function(check=False)
+
+    @property
+    def in_range(self):
+        return self._in_range
+
+    @property
+    def core(self):
+        """
+        :return: the numba compiled scalar approximation of the MF, None if
+        function_generator is not installed
+        """
+        return self._core
+
+    def fuzzify(self, in_value):
+        x = np.clip(np.asarray(in_value, dtype=float), *self._in_range)
+        return np.asarray(self._func(x.ravel())).reshape(x.shape)[()]
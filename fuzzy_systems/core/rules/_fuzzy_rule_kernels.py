@@ -0,0 +1,137 @@
+"""
+Numba compiled kernels used by FuzzyRule for its hot loops.
+
+Numba is an optional dependency: importing this module raises an ImportError
+when it is not installed and FuzzyRule falls back to plain NumPy.
+"""
+import numpy as np
+from numba import config, get_num_threads, njit, prange, set_num_threads
+
+# all the fastmath optimizations except "nnan" and "ninf": the kernels must
+# handle NaN inputs like NumPy does, which these flags would optimize away
+FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(fastmath=FASTMATH, cache=True)
+def interp32(x, xp, fp):
+    """
+    Same as np.interp(x, xp, fp) for a 1D array x but returned in single
+    precision (np.interp always returns float64). The position of x between
+    the in values xp is computed in double precision
+    """
+    n = xp.shape[0]
+    out = np.empty(x.shape[0], dtype=np.float32)
+    for k in range(x.shape[0]):
+        v = x[k]
+        if v != v:
+            out[k] = np.nan
+        elif v < xp[0]:  # strict, as np.interp at repeated first points
+            out[k] = fp[0]
+        elif v >= xp[n - 1]:
+            out[k] = fp[n - 1]
+        else:
+            i = np.searchsorted(xp, v, side="right") - 1
+            t = (v - xp[i]) / (xp[i + 1] - xp[i])
+            out[k] = fp[i] + (fp[i + 1] - fp[i]) * t
+    return out
+
+
+@njit(fastmath=FASTMATH, cache=True)
+def activate_and(fuzzified_inputs):
+    """
+    min t-norm reduction. As np.min, a NaN input gives NaN. The input must not
+    be empty
+    """
+    act = fuzzified_inputs[0]
+    for v in fuzzified_inputs:
+        if v != v:
+            return v
+        if v < act:
+            act = v
+    return act
+
+
+@njit(fastmath=FASTMATH, cache=True)
+def activate_or(fuzzified_inputs):
+    """
+    max t-conorm reduction. As np.max, a NaN input gives NaN. The input must
+    not be empty
+    """
+    act = fuzzified_inputs[0]
+    for v in fuzzified_inputs:
+        if v != v:
+            return v
+        if v > act:
+            act = v
+    return act
+
+
+# not cached: numba compiles a specialization per core function, which cannot
+# be cached on disk
+@njit(fastmath=FASTMATH)
+def fuzzify_core(core, x, lo, hi):
+    """
+    Evaluate the jitted scalar MF core (see SmoothMF.core) on each crisp value
+    of the 1D array x clamped to [lo, hi]. NaN crisp values give NaN
+    """
+    out = np.empty(x.shape[0])
+    for k in range(x.shape[0]):
+        v = x[k]
+        if v != v:
+            out[k] = np.nan
+        else:
+            out[k] = core(min(max(v, lo), hi))
+    return out
+
+
+@njit(fastmath=FASTMATH, cache=True)
+def implicate_min(mf_values, act, out):
+    """
+    Write min(mf_values[i], act) into out[i]. As np.minimum, NaN propagates
+    """
+    for i in range(mf_values.shape[0]):
+        v = mf_values[i]
+        out[i] = v if v < act or v != v else act
+    return out
+
+
+@njit(fastmath=FASTMATH, cache=True)
+def implicate_prod(mf_values, act, out):
+    """
+    Write mf_values[i] * act into out[i]. As np.multiply, NaN propagates
+    """
+    for i in range(mf_values.shape[0]):
+        out[i] = mf_values[i] * act
+    return out
+
+
+def fuzzify_lut_parallel(crisp_values, luts, x0, inv_dx, is_not, out,
+                         n_threads):
+    """
+    Fuzzify crisp_values[p, a] with the lookup table luts[a] (see
+    compute_lut()) for every sample p in parallel on n_threads of numba's
+    threads, applying the NOT operator where is_not[a] is set. Results are
+    written into out, NaN crisp values give NaN.
+    """
+    previous_n_threads = get_num_threads()
+    set_num_threads(min(n_threads, config.NUMBA_NUM_THREADS))
+    try:
+        return _fuzzify_lut_parallel(crisp_values, luts, x0, inv_dx, is_not,
+                                     out)
+    finally:
+        set_num_threads(previous_n_threads)
+
+
+@njit(parallel=True, fastmath=FASTMATH, cache=True)
+def _fuzzify_lut_parallel(crisp_values, luts, x0, inv_dx, is_not, out):
+    n_samples, n_ants = crisp_values.shape
+    last = luts.shape[1] - 1
+    for p in prange(n_samples):
+        for a in range(n_ants):
+            pos = (crisp_values[p, a] - x0[a]) * inv_dx[a] + 0.5
+            if pos != pos:
+                out[p, a] = np.nan
+                continue
+            val = luts[a, int(min(max(pos, 0.0), last))]
+            out[p, a] = 1.0 - val if is_not[a] else val
+    return out
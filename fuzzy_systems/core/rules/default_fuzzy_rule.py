@@ -21,7 +21,7 @@ class DefaultFuzzyRule(FuzzyRule):
             impl_func=impl_func
         )
 
-    def __repr__(self):
+    def _format_repr(self):
         text = "ELSE ({})"
 
         cons_text = " {} ".format(self._impl_func[1]).join(
@@ -1,11 +1,57 @@
 from collections import defaultdict
-from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Callable, Tuple
 import numpy as np
 
-from fuzzy_systems.core.membership_functions.free_shape_mf import FreeShapeMF
+from fuzzy_systems.core.membership_functions.free_shape_mf import \
+    FreeShapeMF, buffer_view_mf
+from fuzzy_systems.core.membership_functions.lin_piece_wise_mf import \
+    compute_lut, lut_lookup, quantize_lut
+from fuzzy_systems.core.membership_functions.smooth_mf import SmoothMF
 from fuzzy_systems.core.rules.fuzzy_rule_element import Antecedent, Consequent
 
+try:
+    from fuzzy_systems.core.rules import _fuzzy_rule_kernels as kernels
+except ImportError:  # numba is not installed, use the NumPy code paths
+    kernels = None
+
+try:
+    import cupy
+except ImportError:  # cupy is not installed, rule bases are evaluated on CPU
+    cupy = None
+
+# Map the labels of the usual activation and implication functions (see
+# fuzzy_systems.core.fis.fis) to the kind of operation they perform, so rules
+# can use specialized code for them
+ACT_FUNC_KINDS = {"AND_min": "min", "min": "min", "MIN": "min",
+                  "OR_max": "max", "max": "max", "MAX": "max",
+                  "PROD": "product", "product": "product"}
+IMPL_FUNC_KINDS = {"MIN": "min", "min": "min",
+                   "PROD": "product", "product": "product"}
+
+# number of entries of the antecedents' lookup tables
+ANT_LUT_SIZE = 1024
+
+# neutral element of each kind of activation, used to pad rules with fewer
+# antecedents than the others when a whole rule base is evaluated at once
+ACT_NEUTRAL_ELEMENTS = {"min": 1.0, "max": 0.0, "product": 1.0}
+
+
+def _stack_padded(arrays, dtype=np.float64):
+    """
+    Stack 1D arrays of different lengths into a 2D array. Shorter arrays are
+    padded with their last value.
+    """
+    n = max([len(a) for a in arrays], default=0)
+    stacked = np.empty((len(arrays), n), dtype=dtype)
+    for i, a in enumerate(arrays):
+        stacked[i, :len(a)] = a
+        stacked[i, len(a):] = a[-1]
+    return stacked
+
 
 class FuzzyRule:
     def __init__(self,
@@ -39,6 +85,114 @@ class FuzzyRule:
         self._cons = cons
         self._impl_func = impl_func
 
+        # both only depend on the rule's definition, computed once
+        self._out_names = tuple(con.lv_name.name for con in cons)
+        self._repr = None
+
+        # Struct of arrays view of the antecedents, in the same order as the
+        # antecedents list, so that the hot methods do not have to walk
+        # through the antecedents' objects on every call. MF values are padded
+        # (by repeating their last point, which does not change the
+        # interpolation) to be stacked together.
+        ant_mfs = [a.lv_name[a.lv_value] for a in ants]
+        self._ant_names = [a.lv_name.name for a in ants]
+        self._ant_is_not = np.array([a.is_not for a in ants], dtype=bool)
+        self._ant_in_values = _stack_padded([mf.in_values for mf in ant_mfs])
+        self._ant_mf_values = _stack_padded([mf.mf_values for mf in ant_mfs],
+                                            dtype=np.float32)
+
+        # lookup tables of the antecedents. Only the MF that provide one
+        # (see LinPWMF) are fuzzified with it, the others are interpolated
+        self._ant_has_lut = np.array([hasattr(mf, "lut") for mf in ant_mfs],
+                                     dtype=bool)
+        ant_luts = [self._get_lut(mf, ANT_LUT_SIZE) for mf in ant_mfs]
+        self._ant_lut_x0 = np.array([x0 for x0, _, _ in ant_luts])
+        self._ant_lut_inv_dx = np.array([inv_dx for _, inv_dx, _ in ant_luts])
+        self._ant_lut = np.array([values for _, _, values in ant_luts],
+                                 dtype=np.float32
+                                 ).reshape(len(ants), ANT_LUT_SIZE)
+
+        # single crisp values are fuzzified with the MF's fuzzify_hinted()
+        # when it has one (see LinPWMF). The hints are kept by the rule since
+        # MF can be shared
+        self._ant_hinted_funcs = [getattr(mf, "fuzzify_hinted", None)
+                                  for mf in ant_mfs]
+        self._ant_hints = [0] * len(ants)
+
+        # MF whose exact functional form is known (see SmoothMF) are better
+        # evaluated with it than with a lookup table or an interpolation
+        self._ant_smooth_funcs = [mf.fuzzify if isinstance(mf, SmoothMF)
+                                  else None for mf in ant_mfs]
+        # with numba, their compiled scalar version (see SmoothMF.core) is
+        # called from a jitted loop instead
+        self._ant_smooth_cores = [
+            (mf.core, mf.in_range) if kernels is not None and isinstance(
+                mf, SmoothMF) and mf.core is not None else None
+            for mf in ant_mfs]
+
+        # lv name -> positions of its antecedents, so inputs that are not
+        # used by this rule can be discarded with a dict lookup
+        self._ant_by_name = defaultdict(list)
+        for i, lv_name in enumerate(self._ant_names):
+            self._ant_by_name[lv_name].append(i)
+        self._ant_by_name = dict(self._ant_by_name)
+
+        # same for the consequents. MF of different consequents are not
+        # stacked since the implicated MF share their in values
+        con_mfs = [c.lv_name[c.lv_value] for c in cons]
+        self._con_names = [c.lv_name.name for c in cons]
+        self._con_in_values = [mf.in_values for mf in con_mfs]
+        self._con_mf_values = [mf.mf_values for mf in con_mfs]
+
+        # fuzzify() memoization: a 1-slot cache for the (very common) case
+        # where the same inputs are given twice in a row, backed by a LRU
+        # cache for inputs that come back later (e.g. quantized sensors)
+        self._last_fuzzify = None
+        self._fuzzify_cached = lru_cache(maxsize=1024)(self._fuzzify_tuple)
+
+        # specialized kernels for well known activation/implication functions
+        # (None if unknown or if numba is not available)
+        self._act_kind = ACT_FUNC_KINDS.get(
+            ant_act_func[1] if ant_act_func is not None else None)
+        self._impl_kind = IMPL_FUNC_KINDS.get(
+            impl_func[1] if impl_func is not None else None)
+        self._act_kernel = None
+        self._impl_kernel = None
+        if kernels is not None:
+            self._act_kernel = {"min": kernels.activate_and,
+                                "max": kernels.activate_or
+                                }.get(self._act_kind)
+            self._impl_kernel = {"min": kernels.implicate_min,
+                                 "product": kernels.implicate_prod
+                                 }.get(self._impl_kind)
+
+        # NumPy fallback of the activation and implication kernels
+        self._act_reduce = {"min": np.min, "max": np.max,
+                            "product": np.prod}.get(self._act_kind)
+        self._impl_ufunc = {"min": np.minimum,
+                            "product": np.multiply}.get(self._impl_kind)
+
+        # output buffers of the implication, one per consequent
+        # (kept in single precision when the MF values are)
+        self._impl_buffers = [
+            np.empty(len(mf_values), np.result_type(mf_values, np.float32))
+            for mf_values in self._con_mf_values]
+
+        # implicated consequents returned by implicate(), grouped by output
+        # variable. They are allocated once and their MF values are read-only
+        # views of the buffers above, refreshed on each implicate() call (see
+        # buffer_view_mf()). The mapping is read-only so callers cannot alter
+        # it
+        impl_out = defaultdict(list)
+        for lv_name, in_values, buffer in zip(
+                self._con_names, self._con_in_values, self._impl_buffers):
+            impl_out[lv_name].append(buffer_view_mf(in_values, buffer))
+        self._impl_out = MappingProxyType(
+            {lv_name: tuple(mfs) for (lv_name, mfs) in impl_out.items()})
+
+        self._interp = kernels.interp32 if kernels is not None \
+            else np.interp
+
     @property
     def antecedents(self):
         return self._ants
@@ -55,40 +209,148 @@ class FuzzyRule:
         user's/dataset sample input. Example crisp_inputs = {"temperature": 18,
         "sunshine": 55}
 
+        The MF are interpolated exactly, whereas fuzzify_batch() reads them
+        from lookup tables. See fuzzify_batch() for the difference.
+
         :return: a list of fuzzified inputs (same size as the number of
         antecedents) for this particular rule
         """
-        fuzzified_inputs_for_rule = []
-        for (lv_name, crisp_input) in crisp_inputs.items():
-            # this flag is set to True if the LV with a given name exists in
-            # the antecendents list
-            lv_exists = False
-            # membership function of the linguistic value
-            mf = None
-            # this flag is set to True if NOT operator has to be applied
-            # to the the corresponding antecedant
-            is_not = False
-            for ant in self._ants:
-                # Find the corresponding LV in the antecedents list
-                # Pick the linguistic value of the LV specified in the
-                # antecedents list
-                # Pick the MF corresponding to this linguistic value
-                if(ant.lv_name.name == lv_name):
-                    lv_exists = True
-                    lvalue_dict = ant.lv_name.ling_values
-                    mf = lvalue_dict[ant.lv_value]
-                    is_not = ant.is_not
-                    break
-            if not lv_exists:
+        key = tuple(sorted((lv_name, float(crisp_input)) for
+                           (lv_name, crisp_input) in crisp_inputs.items()
+                           if lv_name in self._ant_by_name))
+        # the key and its result are read and stored as a single tuple so
+        # that threads sharing the rule never see a mismatched pair
+        last = self._last_fuzzify
+        if last is None or last[0] != key:
+            last = (key, self._fuzzify_cached(key))
+            self._last_fuzzify = last
+        return list(last[1])
+
+    def _fuzzify_tuple(self, key: Tuple[Tuple[str, float], ...]) -> \
+            Tuple[float, ...]:
+        """
+        Fuzzify a single sample given as a hashable key. Only meant to be
+        called through the fuzzify() caches.
+
+        :param key: sorted tuple of (lv name, crisp input) pairs
+        :return: the fuzzified inputs as a tuple
+        """
+        crisp_inputs = dict(key)
+        fuzzified_inputs = []
+        for i, lv_name in enumerate(self._ant_names):
+            if lv_name not in crisp_inputs:
                 continue
-            # Fuzzify the MF previously found at the given point
-            fuzzified_value = np.interp(crisp_input, mf.in_values, mf.mf_values)
-            # Apply the NOT operator if needed
-            if(is_not == True):
-                fuzzified_value = 1 - fuzzified_value
-            fuzzified_inputs_for_rule.append(fuzzified_value)
+            fuzzify_hinted = self._ant_hinted_funcs[i]
+            if fuzzify_hinted is not None:
+                val, self._ant_hints[i] = fuzzify_hinted(
+                    crisp_inputs[lv_name], self._ant_hints[i])
+                if self._ant_is_not[i]:
+                    val = 1.0 - val
+            else:
+                val = self._fuzzify_ant(i, np.asarray(
+                    [crisp_inputs[lv_name]]))[0]
+            fuzzified_inputs.append(val)
+        return tuple(fuzzified_inputs)
+
+    def fuzzify_batch(self, crisp_inputs: Dict[str, np.ndarray],
+                      n_jobs=1) -> np.ndarray:
+        """
+        Vectorized version of fuzzify(). Fuzzify a whole batch of samples on
+        each rule's antecedents at once.
+
+        Unlike fuzzify(), the MF that have a lookup table (see LinPWMF) are
+        read from it instead of being interpolated. The crisp values are
+        rounded to the nearest of the table's ANT_LUT_SIZE entries, so the
+        results can differ from fuzzify() by up to half a table step times
+        the MF slope (about 5e-4 for a MF rising from 0 to 1 over the whole
+        range of its in values, 1e-3 over half of it).
+
+        :param crisp_inputs: a dict where keys are variables name and values
+        are 1D arrays of crisp values, one per sample. All arrays must have
+        the same length. Example crisp_inputs = {"temperature": [18, 21],
+        "sunshine": [55, 80]}
+
+        :param n_jobs: if greater than 1, samples are fuzzified in parallel.
+        If numba is installed and all the antecedents have a lookup table,
+        n_jobs of numba's threads are used (at most NUMBA_NUM_THREADS),
+        otherwise the batch is split in n_jobs chunks fuzzified by a pool of
+        n_jobs threads.
+
+        :return: a 2D array of shape (n_samples, n_ants) where each column
+        contains the fuzzified inputs of an antecedent. Antecedents whose
+        linguistic variable is not in crisp_inputs are skipped.
+        """
+        if n_jobs > 1:
+            return self._fuzzify_batch_parallel(crisp_inputs, n_jobs)
+
+        fuzzified_columns = [self._fuzzify_ant(i, crisp_inputs[lv_name]) for
+                             i, lv_name in enumerate(self._ant_names)
+                             if lv_name in crisp_inputs]
+
+        if not fuzzified_columns:
+            n_samples = len(next(iter(crisp_inputs.values()), []))
+            return np.empty((n_samples, 0))
+        return np.column_stack(fuzzified_columns)
+
+    def _fuzzify_ant(self, i, crisp_values):
+        """
+        Fuzzify an array of crisp values on the i-th antecedent
+        :return: a new array of fuzzified values
+        """
+        crisp_values = np.asarray(crisp_values, dtype=float)
+        if self._ant_has_lut[i]:
+            vals = lut_lookup(crisp_values, self._ant_lut_x0[i],
+                              self._ant_lut_inv_dx[i], self._ant_lut[i])
+        elif self._ant_smooth_cores[i] is not None:
+            core, (lo, hi) = self._ant_smooth_cores[i]
+            vals = kernels.fuzzify_core(core, crisp_values, lo, hi)
+        elif self._ant_smooth_funcs[i] is not None:
+            vals = self._ant_smooth_funcs[i](crisp_values)
+        else:
+            vals = self._interp(crisp_values, self._ant_in_values[i],
+                                self._ant_mf_values[i])
+        # Apply the NOT operator if needed
+        if self._ant_is_not[i]:
+            np.subtract(1.0, vals, out=vals)
+        return vals
+
+    def _fuzzify_batch_parallel(self, crisp_inputs, n_jobs):
+        ant_ids = [i for i, lv_name in enumerate(self._ant_names)
+                   if lv_name in crisp_inputs]
+        if not ant_ids:
+            return self.fuzzify_batch(crisp_inputs)
+
+        if kernels is not None and self._ant_has_lut[ant_ids].all():
+            crisp_values = np.column_stack(
+                [np.asarray(crisp_inputs[self._ant_names[i]], dtype=float)
+                 for i in ant_ids])
+            return kernels.fuzzify_lut_parallel(
+                crisp_values, self._ant_lut[ant_ids],
+                self._ant_lut_x0[ant_ids], self._ant_lut_inv_dx[ant_ids],
+                self._ant_is_not[ant_ids],
+                np.empty(crisp_values.shape, dtype=np.float32), n_jobs)
+
+        # NumPy releases the GIL in its array loops so a thread pool is enough
+        crisp_inputs = {lv_name: np.asarray(crisp_values) for
+                        (lv_name, crisp_values) in crisp_inputs.items()}
+        n_samples = len(next(iter(crisp_inputs.values())))
+        bounds = np.linspace(0, n_samples, n_jobs + 1).astype(int)
+        chunks = [{lv_name: crisp_values[start:stop] for
+                   (lv_name, crisp_values) in crisp_inputs.items()}
+                  for start, stop in zip(bounds[:-1], bounds[1:])]
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            return np.concatenate(list(executor.map(self.fuzzify_batch,
+                                                    chunks)))
 
-        return fuzzified_inputs_for_rule
+    @staticmethod
+    def _get_lut(mf, n_lut):
+        """
+        :return: the MF's own lookup table if it has one of the requested
+        size, a new one otherwise (see compute_lut())
+        """
+        if hasattr(mf, "lut") and len(mf.lut[2]) == n_lut:
+            return mf.lut
+        return compute_lut(mf.in_values, mf.mf_values, n_lut)
 
     def activate(self, fuzzified_inputs):
         """
@@ -96,6 +358,16 @@ class FuzzyRule:
         :param fuzzified_inputs:
         :return: a scalar that represents the antecedents activation
         """
+        if len(fuzzified_inputs) == 0:
+            raise ValueError("Cannot activate rule {}: no fuzzified "
+                             "input".format(self))
+
+        if self._act_kernel is not None:
+            return self._act_kernel(
+                np.asarray(fuzzified_inputs, dtype=np.float64))
+        if self._act_reduce is not None:
+            return self._act_reduce(np.asarray(fuzzified_inputs))
+
         ant_val = fuzzified_inputs[0]
 
         # apply the rule antecedent function using a sliding window of size 2
@@ -104,7 +376,7 @@ class FuzzyRule:
 
         return ant_val
 
-    def implicate(self, antecedents_activation):
+    def implicate(self, antecedents_activation, copy_result=False):
         """
         Compute and return the rule's implication for all the consequents for
         this particular rule.
@@ -113,36 +385,116 @@ class FuzzyRule:
 
         :param antecedents_activation: the rule's antecedents activation value.
         So the scalar value returned by self.activate()
-        :return: a list (in the same order as the consequents were given in
+        :param copy_result: by default, the returned mapping and FreeShapeMF
+        objects are owned by the rule, read-only and overwritten by the next
+        call to implicate(), so they must be consumed before. Set it to True
+        to get a new dict of new objects instead.
+        :return: a mapping where keys are the output variables name and values
+        are sequences (in the same order as the consequents were given in
         the constructor) of FreeShapeMF objects that represents the rule's
         consequents (i.e. output variables) after applying the implication
         operation
         """
 
         impl_func = self._impl_func[0]
-        implicated_consequents = defaultdict(list)
-
-        for con in self._cons:
-            # get the output variable's MF used by this specific consequent
-            # in this rule. For example the MF of "warm" in the case of
-            # the linguistic variable "temperature".
-            ling_value = con.lv_name[con.lv_value]
 
-            in_values = deepcopy(ling_value.in_values)  # FIXME deepcopy needed?
-            mf_values = [impl_func([val, antecedents_activation]) for
-                         val in ling_value.mf_values]
+        for con_mf_values, buffer in zip(self._con_mf_values,
+                                         self._impl_buffers):
+            # con_mf_values are the output variable's MF values used by a
+            # consequent in this rule. For example the MF of "warm" in the
+            # case of the linguistic variable "temperature".
+            if self._impl_kernel is not None:
+                self._impl_kernel(con_mf_values, float(antecedents_activation),
+                                  buffer)
+            elif self._impl_ufunc is not None:
+                self._impl_ufunc(con_mf_values, antecedents_activation,
+                                 out=buffer)
+            else:
+                buffer[:] = [impl_func([val, antecedents_activation]) for
+                             val in con_mf_values]
 
-            # lv_name.name is the name of the linguistic variable, e.g.
-            # "temperature"
-            implicated_consequents[con.lv_name.name].append(
-                FreeShapeMF(in_values, mf_values))
+        if not copy_result:
+            return self._impl_out
 
+        # FreeShapeMF copies the (writable) buffers but shares the read-only
+        # in values
+        implicated_consequents = {}
+        for lv_name, in_values, buffer in zip(
+                self._con_names, self._con_in_values, self._impl_buffers):
+            implicated_consequents.setdefault(lv_name, []).append(
+                FreeShapeMF(in_values, buffer))
         return implicated_consequents
 
+    def compile(self, mode="njit") -> Callable:
+        """
+        Generate and compile with numba a function specialized for this rule
+        that computes its antecedents activation from crisp values. The
+        antecedents' lookup tables, NOT operators and activation function are
+        baked into the generated code, so calling it involves no dispatch at
+        all. Intended for rule bases that do not change once built.
+
+        The compiled function takes one crisp value per linguistic variable
+        used by the antecedents, in the order they first appear in the
+        antecedents list, e.g. f(temperature, sunshine). Requires numba.
+
+        :param mode: "njit" to get a jitted function, "vectorize" to get a
+        parallel numpy ufunc (to call on arrays of crisp values) or "cfunc" to
+        get a numba cfunc (whose .address is a C function pointer)
+        :return: the compiled function, which returns NaN when any of its
+        crisp values is NaN
+        """
+        import numba
+
+        reduce_formats = {"min": "min({})", "max": "max({})",
+                          "product": "{}"}
+        if self._act_kind not in reduce_formats or not self._ant_names:
+            raise ValueError("Cannot compile rule {}: it needs antecedents and "
+                             "a min, max or product activation".format(self))
+
+        arg_names = list(self._ant_by_name)
+        n_lut = self._ant_lut.shape[1]
+        namespace = {"NAN": np.nan}
+        lines = ["def _compiled_rule({}):".format(", ".join(
+            "v{}".format(j) for j in range(len(arg_names))))]
+        # a NaN crisp value would be cast to a garbage index in the tables
+        for j in range(len(arg_names)):
+            lines.append("    if v{j} != v{j}:\n        return NAN".format(j=j))
+        for i, lv_name in enumerate(self._ant_names):
+            namespace["LUT{}".format(i)] = self._ant_lut[i].copy()
+            lines.append(
+                "    f{i} = {not_op}LUT{i}[int(min(max((v{j} - {x0!r}) * "
+                "{inv_dx!r} + 0.5, 0.0), {last}))]".format(
+                    i=i, j=arg_names.index(lv_name),
+                    not_op="1.0 - " if self._ant_is_not[i] else "",
+                    x0=float(self._ant_lut_x0[i]),
+                    inv_dx=float(self._ant_lut_inv_dx[i]),
+                    last=float(n_lut - 1)))
+        separator = " * " if self._act_kind == "product" else ", "
+        lines.append("    return " + reduce_formats[self._act_kind].format(
+            separator.join("f{}".format(i)
+                           for i in range(len(self._ant_names)))))
+        exec("\n".join(lines), namespace)
+        py_func = namespace["_compiled_rule"]
+
+        signature = "float64({})".format(", ".join(["float64"] *
+                                                   len(arg_names)))
+        if mode == "njit":
+            return numba.njit(signature, fastmath=kernels.FASTMATH)(py_func)
+        if mode == "vectorize":
+            return numba.vectorize([signature], target="parallel")(py_func)
+        if mode == "cfunc":
+            return numba.cfunc(signature, fastmath=kernels.FASTMATH)(py_func)
+        raise ValueError("Unknown compilation mode: {}".format(mode))
+
     def get_output_variable_names(self):
-        return [con.lv_value.name for con in self.consequents]
+        return self._out_names
 
     def __repr__(self):
+        if self._repr is None:
+            self._repr = self._format_repr()
+        return self._repr
+
+    def _format_repr(self):
         text = "IF ({}), THEN ({})"
 
         ants_text = " {} ".format(self._ant_act_func[1]).join(
@@ -154,3 +506,162 @@ class FuzzyRule:
              self.consequents])
 
         return text.format(ants_text, cons_text)
+
+    @staticmethod
+    def evaluate_rulebase(rules, crisp_inputs: Dict[str, np.ndarray],
+                          n_lut=1024, use_gpu=False,
+                          lut_dtype=None) -> np.ndarray:
+        """
+        Compute the antecedents activation of every rule of a rule base for
+        a whole batch of samples at once. This is the vectorized equivalent
+        of calling fuzzify() then activate() on each rule for each sample.
+
+        All the antecedents' MF are sampled into a
+        (n_rules, n_ants_max, n_lut) lookup table so that every antecedent of
+        every rule is fuzzified for every sample in a single fancy-indexing
+        operation. The tables are cached, so evaluating the same rule base
+        again does not rebuild them.
+
+        Only rules whose activation function is min, max or product based (see
+        ACT_FUNC_KINDS) are supported.
+
+        :param rules: the rules to evaluate (a list of FuzzyRule)
+        :param crisp_inputs: a dict where keys are variables name and values
+        are 1D arrays of crisp values, one per sample. It must contain all
+        the variables used by the rules' antecedents
+        :param n_lut: number of entries of the lookup table of each MF
+        :param use_gpu: if True, the evaluation runs on the GPU with cupy.
+        Worth it for large batches/rule bases (n_samples * n_rules * n_ants
+        above ~10^6)
+        :param lut_dtype: None to use float64 lookup tables, np.uint8 or
+        np.uint16 to use quantized ones (see quantize_lut()). Fuzzified values
+        are kept quantized through the min/max activations and only converted
+        back to floats at the end.
+        :return: a 2D array of shape (n_samples, n_rules) of antecedents
+        activations
+        """
+        rulebase = _stack_rulebase(tuple(rules), n_lut, lut_dtype)
+        xp = np
+        if use_gpu:
+            if cupy is None:
+                raise ImportError("cupy is required to use the GPU")
+            xp = cupy
+            rulebase = rulebase.on_device()
+
+        X = xp.column_stack([xp.asarray(crisp_inputs[lv_name], dtype=float)
+                             for lv_name in rulebase.lv_names])
+
+        # F[p, r, a] = fuzzified value of antecedent a of rule r for sample p
+        # NaN inputs would be cast to invalid indexes: they are looked up at
+        # entry 0 and the activation of their rules is set to NaN afterwards
+        X_ants = X[:, rulebase.lv_index]
+        is_nan = xp.isnan(X_ants) & rulebase.ant_mask
+        pos = (X_ants - rulebase.x0) * rulebase.inv_dx + 0.5
+        pos = xp.where(xp.isnan(pos), 0.0, pos)
+        idx = xp.clip(pos, 0, n_lut - 1).astype(xp.intp)
+        F = rulebase.lut[rulebase.rule_index, rulebase.ant_index, idx]
+        F = xp.where(rulebase.not_mask, rulebase.lut_one - F, F)
+
+        # min and max commute with the dequantization, product does not
+        activations = xp.empty(F.shape[:2])
+        for kind, reduce_func in (("min", xp.min), ("max", xp.max),
+                                  ("product", xp.prod)):
+            rule_ids = rulebase.rules_by_kind[kind]
+            if len(rule_ids) == 0:
+                continue
+            F_kind = F[:, rule_ids, :]
+            if rulebase.lut_scale is None:
+                activations[:, rule_ids] = reduce_func(F_kind, axis=2)
+            elif kind == "product":
+                activations[:, rule_ids] = reduce_func(
+                    F_kind * rulebase.lut_scale, axis=2)
+            else:
+                activations[:, rule_ids] = reduce_func(
+                    F_kind, axis=2) * rulebase.lut_scale
+        activations[is_nan.any(axis=2)] = xp.nan
+
+        if use_gpu:
+            return cupy.asnumpy(activations)
+        return activations
+
+
+class _StackedRuleBase:
+    """
+    Struct of arrays representation of a rule base used by
+    FuzzyRule.evaluate_rulebase()
+    """
+
+    def __init__(self, rules, n_lut, lut_dtype=None):
+        self.lv_names = sorted({lv_name for r in rules
+                                for lv_name in r._ant_names})
+        lv_columns = {lv_name: i for i, lv_name in enumerate(self.lv_names)}
+
+        n_rules = len(rules)
+        n_ants_max = max([len(r._ant_names) for r in rules], default=0)
+
+        act_kinds = np.array([r._act_kind for r in rules], dtype=object)
+        self.rules_by_kind = {kind: np.flatnonzero(act_kinds == kind) for
+                              kind in ACT_NEUTRAL_ELEMENTS}
+        self.lut = np.empty((n_rules, n_ants_max, n_lut), dtype=np.float32)
+        self.x0 = np.zeros((n_rules, n_ants_max))
+        self.inv_dx = np.zeros((n_rules, n_ants_max))
+        self.lv_index = np.zeros((n_rules, n_ants_max), dtype=np.intp)
+        self.not_mask = np.zeros((n_rules, n_ants_max), dtype=bool)
+        # False for the padding of rules with fewer antecedents
+        self.ant_mask = np.zeros((n_rules, n_ants_max), dtype=bool)
+        self.rule_index = np.arange(n_rules)[:, np.newaxis]
+        self.ant_index = np.arange(n_ants_max)[np.newaxis, :]
+
+        for r, rule in enumerate(rules):
+            if rule._act_kind not in ACT_NEUTRAL_ELEMENTS:
+                raise ValueError("Cannot evaluate rule {}: unsupported "
+                                 "activation function".format(rule))
+
+            # missing antecedents always return the neutral element of the
+            # activation (their inv_dx is 0 so they all map to entry 0)
+            self.lut[r, :, :] = ACT_NEUTRAL_ELEMENTS[rule._act_kind]
+
+            n_ants = len(rule._ant_names)
+            if n_lut == ANT_LUT_SIZE:
+                self.lut[r, :n_ants, :] = rule._ant_lut
+                self.x0[r, :n_ants] = rule._ant_lut_x0
+                self.inv_dx[r, :n_ants] = rule._ant_lut_inv_dx
+            else:
+                for a in range(n_ants):
+                    self.x0[r, a], self.inv_dx[r, a], self.lut[r, a, :] = \
+                        compute_lut(rule._ant_in_values[a],
+                                    rule._ant_mf_values[a], n_lut)
+            self.lv_index[r, :n_ants] = [lv_columns[lv_name] for
+                                         lv_name in rule._ant_names]
+            self.not_mask[r, :n_ants] = rule._ant_is_not
+            self.ant_mask[r, :n_ants] = True
+
+        # value of a membership of 1 in the lookup table, used by NOT
+        self.lut_one = 1.0
+        self.lut_scale = None
+        if lut_dtype is not None:
+            self.lut, self.lut_scale = quantize_lut(self.lut, lut_dtype)
+            self.lut_one = self.lut.dtype.type(np.iinfo(lut_dtype).max)
+
+        self._on_device = None
+
+    def on_device(self):
+        """
+        :return: a copy of this rule base whose arrays are on the GPU (cupy
+        arrays). It is created once then cached.
+        """
+        if self._on_device is None:
+            on_device = copy(self)
+            for name in ("lut", "x0", "inv_dx", "lv_index", "not_mask",
+                         "ant_mask", "rule_index", "ant_index"):
+                setattr(on_device, name, cupy.asarray(getattr(self, name)))
+            on_device.rules_by_kind = {
+                kind: cupy.asarray(rule_ids) for
+                (kind, rule_ids) in self.rules_by_kind.items()}
+            self._on_device = on_device
+        return self._on_device
+
+
+@lru_cache(maxsize=8)
+def _stack_rulebase(rules, n_lut, lut_dtype):
+    return _StackedRuleBase(rules, n_lut, lut_dtype)